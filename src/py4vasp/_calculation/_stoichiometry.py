@@ -246,15 +246,13 @@ class Stoichiometry(base.Refinery):
 
 def raw_stoichiometry_from_ase(structure):
     """Convert the given ase Atoms object to a raw.Stoichiometry."""
-    number_ion_types = []
-    ion_types = []
-    for element in structure.symbols:
-        if ion_types and ion_types[-1] == element:
-            number_ion_types[-1] += 1
-        else:
-            ion_types.append(element)
-            number_ion_types.append(1)
-    return raw.Stoichiometry(number_ion_types, ion_types)
+    # consecutive atoms of the same element form one ion type, so the order of the
+    # atoms is preserved (in contrast to np.unique, which would sort the elements)
+    numbers = structure.numbers
+    first_of_type = np.flatnonzero(np.diff(numbers, prepend=-1))
+    number_ion_types = np.diff(first_of_type, append=len(numbers))
+    ion_types = list(structure.symbols[first_of_type])
+    return raw.Stoichiometry(number_ion_types.tolist(), ion_types)
 
 
 def _merge_to_slice_if_possible(selections):
@@ -285,7 +285,7 @@ def _raise_error_if_option_was_not_removed(selection, option, remaining):
 
 
 @dataclasses.dataclass
-class _DataWrapper(contextlib.AbstractContextManager):
+class _DataWrapper:
     quantity: str
     data: raw.VaspData
     selection: str = None
@@ -305,7 +305,7 @@ class _DataWrapper(contextlib.AbstractContextManager):
         raise exception.IncorrectUsage(message)
 
 
-class _DataAccess(contextlib.AbstractContextManager):
+class _DataAccess:
     def __init__(self, quantity, **kwargs):
         self.selection = None
         self.quantity = quantity
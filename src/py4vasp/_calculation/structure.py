@@ -36,12 +36,16 @@ class _Format:
         return f"Direct{self.newline}"
 
     def vectors_to_table(self, vectors):
-        rows = (self._vector_to_row(vector) for vector in vectors)
-        return f"{self.begin_table}{self.row_separator.join(rows)}{self.end_table}"
-
-    def _vector_to_row(self, vector):
-        elements = (self._element_to_string(element) for element in vector)
-        return self.column_separator.join(elements)
+        buffer = io.StringIO()
+        np.savetxt(
+            buffer,
+            np.atleast_2d(vectors),
+            fmt="%21.16f",
+            delimiter=self.column_separator,
+            newline=self.row_separator,
+        )
+        rows = buffer.getvalue().removesuffix(self.row_separator)
+        return f"{self.begin_table}{rows}{self.end_table}"
 
     def _element_to_string(self, element):
         return f"{element:21.16f}"
@@ -119,11 +123,12 @@ class Structure(slice_.Mixin, base.Refinery, view.Mixin):
 
     def _create_repr(self, format_=_Format(), ion_types=None):
         step = self._get_last_step()
+        stoichiometry = self._stoichiometry()
         lines = (
-            format_.comment_line(self._stoichiometry(), self._step_string(), ion_types),
+            format_.comment_line(stoichiometry, self._step_string(), ion_types),
             format_.scaling_factor(self._scale()),
             format_.vectors_to_table(self._raw_data.cell.lattice_vectors[step]),
-            format_.ion_list(self._stoichiometry(), ion_types),
+            format_.ion_list(stoichiometry, ion_types),
             format_.coordinate_system(),
             format_.vectors_to_table(self._raw_data.positions[step]),
         )
@@ -150,11 +155,12 @@ class Structure(slice_.Mixin, base.Refinery, view.Mixin):
 
         {examples}
         """
+        stoichiometry = self._stoichiometry()
         return {
             "lattice_vectors": self.lattice_vectors(),
             "positions": self.positions(),
-            "elements": self._stoichiometry().elements(ion_types),
-            "names": self._stoichiometry().names(ion_types),
+            "elements": stoichiometry.elements(ion_types),
+            "names": stoichiometry.names(ion_types),
         }
 
     @base.data_access
@@ -310,8 +316,14 @@ class Structure(slice_.Mixin, base.Refinery, view.Mixin):
             message = "Converting multiple structures to LAMMPS is not implemented."
             raise exception.NotImplemented(message)
         number_ion_types = self._raw_data.stoichiometry.number_ion_types
-        cell_string, transformation = self._cell_and_transformation(standard_form)
-        position_lines = self._position_lines(number_ion_types, transformation)
+        lattice_vectors = self.lattice_vectors()
+        cell_string, transformation = self._cell_and_transformation(
+            lattice_vectors, standard_form
+        )
+        cartesian_positions = self.positions() @ lattice_vectors
+        position_lines = self._position_lines(
+            number_ion_types, cartesian_positions, transformation
+        )
         return f"""\
 Configuration 1: system "{self._stoichiometry()}"
 
@@ -324,9 +336,9 @@ Atoms # atomic
 
 {position_lines}"""
 
-    def _cell_and_transformation(self, standard_form):
+    def _cell_and_transformation(self, lattice_vectors, standard_form):
         if standard_form:
-            cell = ase.cell.Cell(self.lattice_vectors())
+            cell = ase.cell.Cell(lattice_vectors)
             cell, transformation = cell.standard_form()
             cell_string = f"""\
 0.0 {self._format_number(cell[0,0])} xlo xhi
@@ -334,7 +346,6 @@ Atoms # atomic
 0.0 {self._format_number(cell[2,2])} zlo zhi
 {self._format_number((cell[1,0], cell[2,0], cell[2,1]))} xy xz yz"""
         else:
-            lattice_vectors = self.lattice_vectors()
             cell_string = f"""\
 {self._format_number(lattice_vectors[0])} avec
 {self._format_number(lattice_vectors[1])} bvec
@@ -343,8 +354,8 @@ Atoms # atomic
             transformation = np.eye(3)
         return cell_string, transformation
 
-    def _position_lines(self, number_ion_types, transformation):
-        positions = self.cartesian_positions() @ transformation.T
+    def _position_lines(self, number_ion_types, cartesian_positions, transformation):
+        positions = cartesian_positions @ transformation.T
         ion_type_labels = [
             str(ion_type + 1)
             for ion_type, number in enumerate(number_ion_types)
@@ -6,6 +6,7 @@ import functools
 import pathlib
 
 import h5py
+import numpy as np
 
 from py4vasp import exception, raw
 from py4vasp._raw.definition import DEFAULT_FILE, DEFAULT_SOURCE, schema
@@ -13,9 +14,15 @@ from py4vasp._raw.mapping import Mapping
 from py4vasp._raw.schema import Length, Link, error_message
 from py4vasp._util import convert
 
+# the default raw-data chunk cache of libhdf5 (1 MiB) is smaller than a single chunk of
+# many VASP datasets, which would then be reread from disk on every slice
+_CHUNK_CACHE = {"rdcc_nbytes": 32 * 1024 * 1024, "rdcc_nslots": 10007, "rdcc_w0": 1.0}
+# datasets with larger chunks get a cache that holds this many of their chunks
+_CHUNKS_IN_CACHE = 8
+
 
 @contextlib.contextmanager
-def _access(quantity, *, selection=None, path=None, file=None):
+def _access(quantity, *, selection=None, path=None, file=None, mmap=False):
     """Create access to a particular quantity from the VASP output.
 
     Parameters
@@ -30,6 +37,10 @@ def _access(quantity, *, selection=None, path=None, file=None):
     file : str, optional
         Keyword-only argument to set the file from which VASP output is read. Defaults
         are set in the schema.
+    mmap : bool, optional
+        Keyword-only argument to memory-map contiguous, uncompressed datasets instead
+        of reading them through HDF5. The data is then only loaded from disk for the
+        elements that are actually accessed.
 
     Returns
     -------
@@ -38,7 +49,7 @@ def _access(quantity, *, selection=None, path=None, file=None):
         that the access terminates at the end of the context to ensure all VASP files
         are properly closed.
     """
-    state = _State(path, file)
+    state = _State(path, file, mmap)
     with state.exit_stack:
         yield state.access(quantity, selection)
 
@@ -56,13 +67,24 @@ def access(*args, **kwargs):
 
 
 class _State:
-    def __init__(self, path, file):
+    def __init__(self, path, file, mmap=False):
         self.exit_stack = contextlib.ExitStack()
         self._files = {}
+        self._quantities = {}
+        self._datasets = {}
+        self._versions = {}
         self._path = path or pathlib.Path(".")
         self._file = file
+        self._mmap = mmap
 
     def access(self, quantity, source):
+        # linked quantities may be requested several times within the same context
+        key = quantity, source or DEFAULT_SOURCE
+        if key not in self._quantities:
+            self._quantities[key] = self._access_quantity(quantity, source)
+        return self._quantities[key]
+
+    def _access_quantity(self, quantity, source):
         source = self._get_source(quantity, source)
         filename = self._file or source.file or DEFAULT_FILE
         path = self._path / pathlib.Path(filename)
@@ -95,7 +117,7 @@ class _State:
 
     def _create_and_enter_context(self, filename):
         try:
-            h5f = h5py.File(filename, "r")
+            h5f = h5py.File(filename, "r", **_CHUNK_CACHE)
         except FileNotFoundError as error:
             message = (
                 f"{filename} could not be opened. Please make sure the file exists."
@@ -112,15 +134,20 @@ class _State:
     def _check_version(self, h5f, required, quantity):
         if not required:
             return
-        version = raw.Version(
-            major=h5f[schema.version.major][()],
-            minor=h5f[schema.version.minor][()],
-            patch=h5f[schema.version.patch][()],
-        )
+        version = self._read_version(h5f)
         if version < required:
             message = f"The {quantity} is not available in VASP {version}. It requires at least {required}."
             raise exception.OutdatedVaspVersion(message)
 
+    def _read_version(self, h5f):
+        if h5f not in self._versions:
+            self._versions[h5f] = raw.Version(
+                major=h5f[schema.version.major][()],
+                minor=h5f[schema.version.minor][()],
+                patch=h5f[schema.version.patch][()],
+            )
+        return self._versions[h5f]
+
     def _get_datasets(self, h5f, data):
         valid_indices = self._get_valid_indices(h5f, data)
         result = {
@@ -148,8 +175,8 @@ class _State:
             return self.access(key.quantity, source=key.source)
         if isinstance(key, Length):
             dataset = h5f.get(key.dataset)
-            return len(dataset) if dataset else None
-        if key.format(0) == key or valid_indices is None:
+            return dataset.shape[0] if dataset is not None else None
+        if valid_indices is None or key.format(0) == key:
             return self._parse_dataset(h5f, key)
         return [self._parse_dataset(h5f, key, index) for index in valid_indices]
 
@@ -158,11 +185,60 @@ class _State:
             if isinstance(index, int):
                 index = index + 1  # convert to Fortran index
             key = key.format(index)
-        result = raw.VaspData(h5f.get(key))
+        # the files are opened read-only, so the same key always yields the same data
+        if (h5f, key) not in self._datasets:
+            self._datasets[h5f, key] = self._read_dataset(h5f, key)
+        return self._datasets[h5f, key]
+
+    def _read_dataset(self, h5f, key):
+        dataset = h5f.get(key)
+        cache_size = _required_chunk_cache(dataset)
+        if self._mmap and _is_contiguous(dataset):
+            dataset = _memory_map(dataset)
+        elif cache_size > _CHUNK_CACHE["rdcc_nbytes"]:
+            del dataset  # the new cache only takes effect if the dataset is closed
+            dataset = _open_with_chunk_cache(h5f, key, cache_size)
+        result = raw.VaspData(dataset)
         if _is_scalar(result):
             result = result[()]
         return result
 
 
+def _is_contiguous(dataset):
+    return (
+        isinstance(dataset, h5py.Dataset)
+        and dataset.ndim > 0
+        and dataset.dtype.kind in "biuf"
+        and dataset.chunks is None
+        and dataset.compression is None
+        and dataset.id.get_offset() is not None
+    )
+
+
+def _memory_map(dataset):
+    return np.memmap(
+        dataset.file.filename,
+        dtype=dataset.dtype,
+        mode="r",
+        offset=dataset.id.get_offset(),
+        shape=dataset.shape,
+    )
+
+
+def _required_chunk_cache(dataset):
+    # libhdf5 does not cache chunks that exceed the cache, so every partial read of
+    # such a chunk would read and decompress it again
+    if not isinstance(dataset, h5py.Dataset) or dataset.chunks is None:
+        return 0
+    return _CHUNKS_IN_CACHE * dataset.dtype.itemsize * np.prod(dataset.chunks)
+
+
+def _open_with_chunk_cache(h5f, key, cache_size):
+    dapl = h5py.h5p.create(h5py.h5p.DATASET_ACCESS)
+    slots, w0 = _CHUNK_CACHE["rdcc_nslots"], _CHUNK_CACHE["rdcc_w0"]
+    dapl.set_chunk_cache(slots, int(cache_size), w0)
+    return h5py.Dataset(h5py.h5d.open(h5f.id, key.encode(), dapl=dapl))
+
+
 def _is_scalar(data):
     return not data.is_none() and data.ndim == 0
@@ -2,10 +2,14 @@
 # Licensed under the Apache License 2.0 (http://www.apache.org/licenses/LICENSE-2.0)
 import textwrap
 
+import h5py
 import numpy as np
 
 from py4vasp import exception
 
+# strided slices read at most this many times the selected data from the file
+_MAX_EXPANDED_STRIDE = 8
+
 
 class VaspData(np.lib.mixins.NDArrayOperatorsMixin):
     """Wraps the data produced by the VASP calculation.
@@ -44,11 +48,26 @@ class VaspData(np.lib.mixins.NDArrayOperatorsMixin):
         else:
             self._data = data
 
-    def __array__(self, *args, **kwargs):
+    def __array__(self, *args, copy=None, **kwargs):
+        if isinstance(self.data, h5py.Dataset):
+            if copy is False:
+                message = "Reading the data from the file always creates a copy."
+                raise ValueError(message)
+            # the array read from the file is new, so there is no need to copy it again
+            return np.asarray(_read_direct(self.data), *args, **kwargs)
+        if copy is not None:
+            kwargs["copy"] = copy
         return np.array(self.data, *args, **kwargs)
 
     def __getitem__(self, key):
-        return self.data[key]
+        data = self.data
+        if isinstance(data, np.ndarray) or not _is_strided(key):
+            return data[key]
+        # strided reads from file are much slower than reading the contiguous range
+        # and selecting every n-th element afterwards, as long as the stride is small;
+        # the copy releases the expanded read
+        contiguous_key, stride_key = _split_strides(key)
+        return np.ascontiguousarray(data[contiguous_key][stride_key])
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self._repr_data})"
@@ -56,6 +75,10 @@ class VaspData(np.lib.mixins.NDArrayOperatorsMixin):
     def __len__(self):
         return len(self.data)
 
+    def __iter__(self):
+        # read all elements at once instead of accessing the file for every element
+        return iter(np.asarray(self))
+
     def is_none(self):
         return self._data is None
 
@@ -101,3 +124,42 @@ def _parse_scalar(data):
     if data.dtype.type == np.bytes_:
         data = data[()].decode()
     return np.array(data)
+
+
+def _read_direct(dataset):
+    array = np.empty(dataset.shape, dataset.dtype)
+    if array.size > 0:
+        dataset.read_direct(array)
+    return array
+
+
+def _is_strided(key):
+    keys = key if isinstance(key, tuple) else (key,)
+    # the strides of all axes multiply the amount of data read from the file
+    expansion = np.prod([key.step for key in keys if _has_stride(key)], dtype=int)
+    return 1 < expansion <= _MAX_EXPANDED_STRIDE
+
+
+def _has_stride(key):
+    return isinstance(key, slice) and key.step is not None and key.step > 1
+
+
+def _split_strides(key):
+    keys = key if isinstance(key, tuple) else (key,)
+    contiguous_key = tuple(
+        slice(key.start, key.stop) if _has_stride(key) else key for key in keys
+    )
+    stride_key = tuple(
+        slice(None, None, key.step) if _has_stride(key) else _keep_axis(key)
+        for key in keys
+        if not _removes_axis(key)
+    )
+    return contiguous_key, stride_key
+
+
+def _removes_axis(key):
+    return isinstance(key, (int, np.integer))
+
+
+def _keep_axis(key):
+    return key if key is Ellipsis else slice(None)
@@ -1,10 +1,10 @@
 # Copyright © VASP Software GmbH,
 # Licensed under the Apache License 2.0 (http://www.apache.org/licenses/LICENSE-2.0)
-import itertools
+import functools
 import os
 import tempfile
 from dataclasses import dataclass
-from typing import NamedTuple, Sequence
+from typing import Sequence
 
 import numpy as np
 import numpy.typing as npt
@@ -13,37 +13,17 @@ from py4vasp import exception
 from py4vasp._util import convert, import_
 
 ase = import_.optional("ase")
-ase_cube = import_.optional("ase.io.cube")
+ase_units = import_.optional("ase.units")
 nglview = import_.optional("nglview")
 
 CUBE_FILENAME = "quantity.cube"
+_CUBE_BUFFER_SIZE = 1 << 20
+_CUBE_VALUES_PER_LINE = 6
 
 
-class _Arrow3d(NamedTuple):
-    tail: npt.ArrayLike
-    """Tail, which is usually the atom centers"""
-    tip: npt.ArrayLike
-    """Tip, which is usually the atom centers + arrows"""
-    color: str = "#2FB5AB"
-    """Color of each arrow"""
-    radius: float = 0.2
-
-    def to_serializable(self):
-        return (
-            list(self.tail),
-            list(self.tip),
-            list(convert.to_rgb(self.color)),
-            self.radius,
-        )
-
-
-def _rotate(arrow, transformation):
-    return _Arrow3d(
-        transformation @ arrow.tail,
-        transformation @ arrow.tip,
-        arrow.color,
-        arrow.radius,
-    )
+@functools.lru_cache(maxsize=64)
+def _to_rgb(color):
+    return tuple(convert.to_rgb(color))
 
 
 @dataclass
@@ -76,26 +56,33 @@ class IonArrow:
     radius: float
     "Radius of the arrows"
 
+    @property
+    def rgb(self):
+        "Color of the arrows as fractional RGB values"
+        return list(_to_rgb(self.color))
 
-_x_axis = _Arrow3d(tail=np.zeros(3), tip=np.array((3, 0, 0)), color="#000000")
-_y_axis = _Arrow3d(tail=np.zeros(3), tip=np.array((0, 3, 0)), color="#000000")
-_z_axis = _Arrow3d(tail=np.zeros(3), tip=np.array((0, 0, 3)), color="#000000")
 
+_axis_rgb = list(_to_rgb("#000000"))
+_axis_radius = 0.2
+_axis_length = 3
 
-def _recenter(arrow, origin=None):
-    if origin is not None:
-        return _Arrow3d(
-            arrow.tail + origin,
-            arrow.tip + origin,
-            arrow.color,
-            arrow.radius,
-        )
-    else:
-        return arrow
+
+def _is_wrapped(positions):
+    # ase wraps the fractional coordinates into the interval [-eps, 1 - eps)
+    eps = 1e-7
+    return np.all(positions >= 0) and np.all(positions < 1 - eps)
 
 
 @dataclass
 class View:
+    """Visualize structures, isosurfaces, and arrows at the atoms with NGL.
+
+    The widget is created the first time the View is displayed and reused afterwards
+    until any attribute is assigned. In-place changes of nested data, e.g., modifying
+    the positions or the color of an ion arrow, are not detected; assign the attribute
+    again, e.g., ``view.ion_arrows = view.ion_arrows``, to display them.
+    """
+
     elements: npt.ArrayLike
     """Elements for all structures in the trajectory"""
     lattice_vectors: npt.ArrayLike
@@ -122,9 +109,16 @@ class View:
     def __post_init__(self):
         self._verify()
 
+    def __setattr__(self, name, value):
+        # drop the cached widget so that the next display reflects the change
+        super().__setattr__(name, value)
+        if name != "_widget":
+            super().__setattr__("_widget", None)
+
     def _ipython_display_(self):
-        widget = self.to_ngl()
-        widget._ipython_display_()
+        if self._widget is None:
+            self._widget = self.to_ngl()
+        self._widget._ipython_display_()
 
     def to_ngl(self):
         """Create a widget with NGL
@@ -134,25 +128,35 @@ class View:
         determine which methods are called (either isosurface, arrows, etc).
         """
         self._verify()
-        trajectory = [self._create_atoms(i) for i in self._iterate_trajectory_frames()]
+        numbers = self._atomic_numbers()
+        positions = self._shifted_positions()
+        trajectory = [
+            self._create_atoms(step, numbers[step], positions[step])
+            for step in self._iterate_trajectory_frames()
+        ]
         ngl_trajectory = nglview.ASETrajectory(trajectory)
         widget = nglview.NGLWidget(ngl_trajectory)
         widget.camera = self.camera
         if self.grid_scalars:
             self._show_isosurface(widget, trajectory)
+        if self.ion_arrows or self.show_axes:
+            # computed after the isosurface, because that may change the cell
+            _, transformation = trajectory[0].cell.standard_form()
         if self.ion_arrows:
-            self._show_arrows_at_atoms(widget, trajectory)
+            self._show_arrows_at_atoms(widget, trajectory, transformation)
         if self.show_cell:
             self._show_cell(widget)
         if self.show_axes:
-            self._show_axes(widget, trajectory)
+            self._show_axes(widget, transformation)
         return widget
 
     def _verify(self):
         self._raise_error_if_present_on_multiple_steps(self.grid_scalars)
         self._raise_error_if_present_on_multiple_steps(self.ion_arrows)
-        self._raise_error_if_number_steps_inconsistent()
-        self._raise_error_if_any_shape_is_incorrect()
+        positions_shape = np.shape(self.positions)
+        cell_shape = np.shape(self.lattice_vectors)
+        self._raise_error_if_number_steps_inconsistent(positions_shape, cell_shape)
+        self._raise_error_if_any_shape_is_incorrect(positions_shape, cell_shape)
 
     def _raise_error_if_present_on_multiple_steps(self, attributes):
         if not attributes:
@@ -166,20 +170,20 @@ one frame in the trajectory. Make sure that either only one frame for the positi
 attribute is supplied with its corresponding grid scalar or ion arrow component."""
                 )
 
-    def _raise_error_if_number_steps_inconsistent(self):
-        if len(self.elements) == len(self.lattice_vectors) == len(self.positions):
+    def _raise_error_if_number_steps_inconsistent(self, positions_shape, cell_shape):
+        number_steps = len(self.elements)
+        if number_steps == cell_shape[0] == positions_shape[0]:
             return
         raise exception.IncorrectUsage(
             "The shape of the arrays is inconsistent. Each of 'elements' (length = "
-            f"{len(self.elements)}), 'lattice_vectors' (length = "
-            f"{len(self.lattice_vectors)}), and 'positions' (length = "
-            f"{len(self.positions)}) should have a leading dimension of the number of"
-            "steps."
+            f"{number_steps}), 'lattice_vectors' (length = {cell_shape[0]}), and "
+            f"'positions' (length = {positions_shape[0]}) should have a leading "
+            "dimension of the number of steps."
         )
 
-    def _raise_error_if_any_shape_is_incorrect(self):
+    def _raise_error_if_any_shape_is_incorrect(self, positions_shape, cell_shape):
         number_elements = len(self.elements[0])
-        _, number_positions, vector_size = np.shape(self.positions)
+        _, number_positions, vector_size = positions_shape
         if number_elements != number_positions:
             raise exception.IncorrectUsage(
                 f"Number of elements ({number_elements}) inconsistent with number of positions ({number_positions})."
@@ -188,18 +192,34 @@ attribute is supplied with its corresponding grid scalar or ion arrow component.
             raise exception.IncorrectUsage(
                 f"Positions must have three components and not {vector_size}."
             )
-        cell_shape = np.shape(self.lattice_vectors)[1:]
+        cell_shape = cell_shape[1:]
         if any(length != 3 for length in cell_shape):
             raise exception.IncorrectUsage(
                 f"Lattice vectors must be a 3x3 unit cell but have the shape {cell_shape}."
             )
 
-    def _create_atoms(self, step):
-        symbols = "".join(self.elements[step])
-        atoms = ase.Atoms(symbols, cell=self.lattice_vectors[step], pbc=True)
-        shift = np.zeros(3) if self.shift is None else self.shift
-        atoms.set_scaled_positions(np.add(self.positions[step], shift))
-        atoms.wrap()
+    def _shifted_positions(self):
+        if self.shift is None:
+            return np.asarray(self.positions)
+        return np.add(self.positions, self.shift)
+
+    def _atomic_numbers(self):
+        first_elements = self.elements[0]
+        if all(np.array_equal(elements, first_elements) for elements in self.elements):
+            # the composition does not change, so the elements are converted only once
+            numbers = ase.symbols.symbols2numbers(first_elements)
+            return [numbers] * len(self.elements)
+        return [ase.symbols.symbols2numbers(elements) for elements in self.elements]
+
+    def _create_atoms(self, step, numbers, positions):
+        atoms = ase.Atoms(
+            numbers=numbers,
+            cell=self.lattice_vectors[step],
+            scaled_positions=positions,
+            pbc=True,
+        )
+        if not _is_wrapped(positions):
+            atoms.wrap()
         atoms = atoms.repeat(self.supercell)
         return atoms
 
@@ -209,36 +229,32 @@ attribute is supplied with its corresponding grid scalar or ion arrow component.
     def _show_cell(self, widget):
         widget.add_unitcell()
 
-    def _show_axes(self, widget, trajectory):
-        _, transformation = trajectory[0].cell.standard_form()
-        x_axis = _rotate(_recenter(_x_axis, self.show_axes_at), transformation)
-        y_axis = _rotate(_recenter(_y_axis, self.show_axes_at), transformation)
-        z_axis = _rotate(_recenter(_z_axis, self.show_axes_at), transformation)
-        widget.shape.add_arrow(*(x_axis.to_serializable()))
-        widget.shape.add_arrow(*(y_axis.to_serializable()))
-        widget.shape.add_arrow(*(z_axis.to_serializable()))
+    def _show_axes(self, widget, transformation):
+        origin = np.zeros(3) if self.show_axes_at is None else self.show_axes_at
+        tails = np.broadcast_to(origin, (3, 3))
+        tips = tails + _axis_length * np.eye(3)
+        rotated_arrows = np.concatenate((tails, tips)) @ transformation.T
+        for tail, tip in zip(rotated_arrows[:3], rotated_arrows[3:]):
+            widget.shape.add_arrow(tail.tolist(), tip.tolist(), _axis_rgb, _axis_radius)
 
     def _set_atoms_in_standard_form(self, atoms):
         cell, _ = atoms.cell.standard_form()
         atoms.set_cell(cell)
 
-    def _repeat_isosurface(self, quantity):
-        quantity_repeated = np.tile(quantity, self.supercell)
-        return quantity_repeated
-
     def _show_isosurface(self, widget, trajectory):
         step = 0
-        for grid_scalar in self.grid_scalars:
-            if not grid_scalar.isosurfaces:
-                continue
-            quantity = grid_scalar.quantity[step]
-            quantity = self._shift_quantity(quantity)
-            quantity = self._repeat_isosurface(quantity)
-            atoms = trajectory[step]
-            self._set_atoms_in_standard_form(atoms)
+        grid_scalars = [scalar for scalar in self.grid_scalars if scalar.isosurfaces]
+        if not grid_scalars:
+            return
+        atoms = trajectory[step]
+        self._set_atoms_in_standard_form(atoms)
+        for grid_scalar in grid_scalars:
+            quantity = np.asarray(grid_scalar.quantity[step])
+            shift_indices = self._shift_indices(quantity)
             with tempfile.TemporaryDirectory() as tmp:
                 filename = os.path.join(tmp, CUBE_FILENAME)
-                ase_cube.write_cube(open(filename, "w"), atoms=atoms, data=quantity)
+                with open(filename, "w", buffering=_CUBE_BUFFER_SIZE) as file:
+                    _write_cube(file, atoms, quantity, self.supercell, shift_indices)
                 component = widget.add_component(filename)
             for isosurface in grid_scalar.isosurfaces:
                 isosurface_options = {
@@ -248,23 +264,63 @@ attribute is supplied with its corresponding grid scalar or ion arrow component.
                 }
                 component.add_surface(**isosurface_options)
 
-    def _shift_quantity(self, quantity):
+    def _shift_indices(self, quantity):
         if self.shift is None:
-            return quantity
+            return np.zeros(3, dtype=np.int_)
         new_grid_center = np.multiply(quantity.shape, self.shift)
-        shift_indices = np.round(new_grid_center).astype(np.int32)
-        return np.roll(quantity, shift_indices, axis=(0, 1, 2))
+        return np.round(new_grid_center).astype(np.int_)
 
-    def _show_arrows_at_atoms(self, widget, trajectory):
+    def _show_arrows_at_atoms(self, widget, trajectory, transformation):
         step = 0
+        tails = trajectory[step].get_positions()
+        rotated_tails = tails @ transformation.T
         for _arrows in self.ion_arrows:
-            _, transformation = trajectory[step].cell.standard_form()
-            arrows = _arrows.quantity[step]
-            positions = trajectory[step].get_positions()
-            for arrow, tail in zip(itertools.cycle(arrows), positions):
-                tip = arrow + tail
-                arrow_3d = _rotate(
-                    _Arrow3d(tail, tip, color=_arrows.color, radius=_arrows.radius),
-                    transformation,
+            # resize repeats the arrows cyclically to match the atoms in the supercell
+            tips = tails + np.resize(_arrows.quantity[step], tails.shape)
+            rotated_tips = tips @ transformation.T
+            color = _arrows.rgb
+            for tail, tip in zip(rotated_tails, rotated_tips):
+                widget.shape.add_arrow(
+                    tail.tolist(), tip.tolist(), color, _arrows.radius
                 )
-                widget.shape.add_arrow(*(arrow_3d.to_serializable()))
+
+
+def _write_cube(file, atoms, quantity, supercell, shift_indices):
+    """Write the quantity rolled by the shift and repeated over the supercell to a file
+    in cube format.
+
+    The data is gathered and written plane by plane so that neither the shifted nor the
+    repeated grid is ever stored in memory as a whole. The format follows
+    ase.io.cube.write_cube."""
+    quantity = np.asarray(quantity)
+    if np.iscomplexobj(quantity):
+        quantity = np.abs(quantity)
+    supercell = np.asarray(supercell, dtype=np.int_)
+    shape = np.multiply(quantity.shape, supercell)
+    file.write("Cube file written by py4vasp\n")
+    file.write("OUTER LOOP: X, MIDDLE LOOP: Y, INNER LOOP: Z\n")
+    file.write(f"{len(atoms):5}{0.0:12.6f}{0.0:12.6f}{0.0:12.6f}\n")
+    for number_points, lattice_vector in zip(shape, atoms.cell):
+        x, y, z = lattice_vector / number_points / ase_units.Bohr
+        file.write(f"{number_points:5}{x:12.6f}{y:12.6f}{z:12.6f}\n")
+    positions = atoms.positions / ase_units.Bohr
+    for number, (x, y, z) in zip(atoms.numbers, positions):
+        file.write(f"{number:5}{0.0:12.6f}{x:12.6f}{y:12.6f}{z:12.6f}\n")
+    x_indices, y_indices, z_indices = (
+        (np.arange(number_points) - shift_index) % length
+        for number_points, shift_index, length in zip(
+            shape, shift_indices, quantity.shape
+        )
+    )
+    for x_index in x_indices:
+        plane = quantity[x_index][np.ix_(y_indices, z_indices)]
+        _write_cube_values(file, plane.ravel())
+
+
+def _write_cube_values(file, values):
+    number_full_lines = len(values) // _CUBE_VALUES_PER_LINE
+    full_lines = values[: number_full_lines * _CUBE_VALUES_PER_LINE]
+    np.savetxt(file, full_lines.reshape(-1, _CUBE_VALUES_PER_LINE), fmt="%e")
+    remainder = values[number_full_lines * _CUBE_VALUES_PER_LINE :]
+    if len(remainder) > 0:
+        np.savetxt(file, remainder[np.newaxis], fmt="%e")
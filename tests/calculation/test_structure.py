@@ -227,6 +227,19 @@ def test_from_poscar(Sr2TiO4, Assert, not_core):
     assert actual["names"] == ["Ba_1", "Ba_2", "Zr_1", "S_1", "S_2", "S_3", "S_4"]
 
 
+def test_from_poscar_is_trajectory_with_single_step(Sr2TiO4, Assert, not_core):
+    structure = Structure.from_POSCAR(REF_POSCAR)
+    check_Sr2TiO4_structure(structure[0].read(), Sr2TiO4.ref, -1, Assert)
+
+
+def test_from_poscar_with_inline_comments(Sr2TiO4, Assert, not_core):
+    poscar = REF_POSCAR.replace("Sr Ti O", "Sr Ti O # species", 1)
+    poscar = poscar.replace("2 1 4", "2 1 4 ! counts", 1)
+    assert poscar.count("#") == 1 and poscar.count("!") == 1
+    structure = Structure.from_POSCAR(poscar)
+    check_Sr2TiO4_structure(structure.read(), Sr2TiO4.ref, -1, Assert)
+
+
 def test_from_poscar_without_elements(Sr2TiO4, Assert, not_core):
     poscar = """\
 POSCAR without elements
@@ -356,6 +369,15 @@ def test_cartesian_positions(Fe3O4, Ca3AsBr3, Assert, not_core):
     check_cartesian_positions(Ca3AsBr3, Assert)
 
 
+def test_cartesian_positions_trajectory(Fe3O4, Assert):
+    steps = slice(1, 3)
+    expected = [
+        positions @ Fe3O4.ref.lattice_vectors[step]
+        for step, positions in enumerate(Fe3O4.ref.positions)
+    ]
+    Assert.allclose(Fe3O4[steps].cartesian_positions(), expected[steps])
+
+
 def check_cartesian_positions(structure, Assert):
     Assert.allclose(structure.cartesian_positions(), structure.to_ase().get_positions())
 
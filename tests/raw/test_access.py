@@ -1,17 +1,20 @@
 # Copyright © VASP Software GmbH,
 # Licensed under the Apache License 2.0 (http://www.apache.org/licenses/LICENSE-2.0)
 import pathlib
-from dataclasses import fields
+from dataclasses import dataclass, fields
 from unittest.mock import MagicMock, call, patch
 
+import h5py
 import numpy as np
 import pytest
-from util import VERSION
+from util import VERSION, Simple, WithLink
 
 import py4vasp.raw as raw
 from py4vasp import exception
+from py4vasp._raw.access import _CHUNK_CACHE
 from py4vasp._raw.definition import DEFAULT_FILE
 from py4vasp._raw.mapping import Mapping
+from py4vasp._raw.schema import Link
 
 
 @pytest.fixture
@@ -25,6 +28,25 @@ def mock_access(complex_schema):
             yield mock_file, sources
 
 
+@dataclass
+class Shared:
+    first: Simple
+    second: Simple
+    data: str
+    same_data: str
+    link: WithLink
+
+
+@pytest.fixture
+def mock_shared_access(mock_access, complex_schema):
+    schema, _ = complex_schema
+    simple = Link("simple", "default")
+    links = {"first": simple, "second": simple, "link": Link("with_link", "default")}
+    datasets = {"data": "baz_dataset", "same_data": "baz_dataset"}
+    schema.add(Shared, required=raw.Version(1, 2, 3), **links, **datasets)
+    return mock_access
+
+
 @pytest.fixture
 def mock_schema(complex_schema):
     schema, sources = complex_schema
@@ -98,7 +120,7 @@ def test_access_with_link(mock_access):
     mock_file, sources = mock_access
     source = sources[quantity]["default"]
     with raw.access(quantity) as with_link:
-        file_calls += [call(pathlib.Path(DEFAULT_FILE), "r")]
+        file_calls += [call(pathlib.Path(DEFAULT_FILE), "r", **_CHUNK_CACHE)]
         get_calls += list(expected_calls(source))
         check_file_access(mock_file, file_calls, get_calls)
         check_data(with_link.baz, source.data.baz)
@@ -190,6 +212,20 @@ def test_required_version(mock_access):
     mock_get_version.assert_has_calls(expected_calls, any_order=True)
 
 
+def test_access_shared_data_once(mock_shared_access):
+    mock_file, _ = mock_shared_access
+    h5f = mock_file.return_value.__enter__.return_value
+    with raw.access("shared") as shared:
+        assert shared.first is shared.second
+        assert shared.first is shared.link.simple
+        assert shared.data is shared.same_data
+        assert shared.data is shared.link.baz
+        assert h5f.get.call_args_list.count(call("baz_dataset")) == 1
+        # both shared and with_link require the version of the same file
+        assert h5f.__getitem__.call_count == 3
+    assert mock_file.call_count == 2
+
+
 def mock_version_dataset(number):
     mock = MagicMock()
     mock.__getitem__.side_effect = lambda _: number
@@ -222,10 +258,10 @@ def test_access_length(mock_access):
     mock_get = mock_file.return_value.__enter__.return_value.get
     source = sources[quantity]["default"]
     mock_data = mock_read_result(source.data.num_data.dataset)
-    mock_data.__len__.side_effect = (num_data,)
+    mock_data.shape = (num_data, 3)
     with raw.access(quantity) as with_length:
         mock_get.assert_called_once_with(source.data.num_data.dataset)
-        mock_data.__len__.assert_called_once_with()
+        mock_data.__len__.assert_not_called()
         assert with_length.num_data == num_data
     mock_get.side_effect = (None,)
     with raw.access(quantity) as with_length:
@@ -245,6 +281,39 @@ def test_access_data_factory(mock_schema, tmp_path):
         assert raw_data.bar == filename
 
 
+@pytest.mark.parametrize("mmap", (False, True))
+def test_access_memory_map(mock_schema, tmp_path, mmap):
+    source = mock_schema["simple"]["default"]
+    foo = np.linspace(0, 1, 12).reshape(3, 4)
+    bar = np.arange(10)
+    with h5py.File(tmp_path / source.file, "w") as h5f:
+        h5f.create_dataset(source.data.foo, data=foo)
+        h5f.create_dataset(source.data.bar, data=bar, chunks=(5,))
+    with raw.access("simple", path=tmp_path, mmap=mmap) as simple:
+        assert isinstance(simple.foo.data, np.memmap) == mmap
+        assert np.array_equal(simple.foo[::2], foo[::2])
+        # chunked datasets cannot be mapped
+        assert isinstance(simple.bar.data, h5py.Dataset)
+        assert np.array_equal(simple.bar, bar)
+
+
+def test_access_large_chunks(mock_schema, tmp_path):
+    source = mock_schema["simple"]["default"]
+    foo = np.zeros((20, 100))
+    bar = np.zeros((20, 100))
+    with h5py.File(tmp_path / source.file, "w") as h5f:
+        h5f.create_dataset(source.data.foo, data=foo, chunks=(2, 100))
+        h5f.create_dataset(source.data.bar, data=bar, chunks=(10, 100))
+    cache_options = {**_CHUNK_CACHE, "rdcc_nbytes": 8 * foo[:2].nbytes}
+    with patch.dict("py4vasp._raw.access._CHUNK_CACHE", cache_options):
+        with raw.access("simple", path=tmp_path) as simple:
+            cache = simple.foo.data.id.get_access_plist().get_chunk_cache()
+            assert cache[1] == cache_options["rdcc_nbytes"]
+            cache = simple.bar.data.id.get_access_plist().get_chunk_cache()
+            assert cache[1] == 8 * bar[:10].nbytes
+            assert np.array_equal(simple.bar, bar)
+
+
 def test_access_version(mock_access):
     quantity = "version"
     mock_file, sources = mock_access
@@ -257,7 +326,7 @@ def test_access_version(mock_access):
 
 
 def check_single_file_access(mock_file, filename, source):
-    file_calls = (call(pathlib.Path(filename), "r"),)
+    file_calls = (call(pathlib.Path(filename), "r", **_CHUNK_CACHE),)
     check_file_access(mock_file, file_calls, expected_calls(source))
 
 
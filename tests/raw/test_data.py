@@ -2,6 +2,7 @@
 # Licensed under the Apache License 2.0 (http://www.apache.org/licenses/LICENSE-2.0)
 from unittest.mock import MagicMock
 
+import h5py
 import hypothesis.extra.numpy as np_strat
 import hypothesis.strategies as strategy
 import numpy as np
@@ -119,6 +120,7 @@ def test_slices(array_slice, Assert):
         lambda vasp: np.array(vasp),
         lambda vasp: vasp[:],
         lambda vasp: len(vasp),
+        lambda vasp: list(vasp),
         lambda vasp: vasp.ndim,
         lambda vasp: vasp.size,
         lambda vasp: vasp.shape,
@@ -160,6 +162,96 @@ def test_scalar_string():
     assert vasp.data == reference
 
 
+def test_iterate_reads_data_once():
+    reference = np.array([b"Sr", b"Ti", b"O"])
+    mock = MagicMock()
+    mock.__array__ = MagicMock(return_value=reference)
+    vasp = VaspData(mock)
+    assert list(vasp) == list(reference)
+    mock.__array__.assert_called_once()
+    mock.__getitem__.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        slice(None, None, 3),
+        slice(1, 8, 2),
+        (slice(None, None, 2), 1),
+        (2, slice(0, 3, 2)),
+        (Ellipsis, slice(None, None, 2)),
+        (slice(None, None, 4), [0, 2]),
+        (slice(None, None, 2), slice(None, None, 2)),
+    ],
+)
+def test_strided_slice_reads_contiguous_range(key, Assert):
+    array = np.arange(40).reshape(10, 4)
+    mock = MagicMock()
+    mock.__array__ = lambda *args, **kwargs: array
+    mock.__getitem__.side_effect = lambda key: array[key]
+    vasp = VaspData(mock)
+    Assert.allclose(vasp[key], array[key])
+    read_key = mock.__getitem__.call_args.args[0]
+    assert not any(isinstance(k, slice) and k.step for k in read_key)
+
+
+@pytest.mark.parametrize(
+    "reference", [np.arange(12.0).reshape(3, 4), np.array([b"Sr", b"Ti"]), np.zeros(0)]
+)
+def test_read_from_file(reference, tmp_path):
+    filename = tmp_path / "data.h5"
+    with h5py.File(filename, "w") as file:
+        file["data"] = reference
+    with h5py.File(filename, "r") as file:
+        vasp = VaspData(file["data"])
+        actual = np.array(vasp)
+        assert isinstance(actual, np.ndarray)
+        assert np.array_equal(actual, reference)
+        assert np.array(vasp, reference.dtype).dtype == reference.dtype
+
+
+def test_read_from_file_without_copy(tmp_path):
+    filename = tmp_path / "data.h5"
+    with h5py.File(filename, "w") as file:
+        file["data"] = np.arange(5)
+    with h5py.File(filename, "r") as file:
+        with pytest.raises(ValueError):
+            VaspData(file["data"]).__array__(copy=False)
+
+
+def test_large_stride_is_not_expanded(Assert):
+    array = np.arange(1000)
+    mock = MagicMock()
+    mock.__array__ = lambda *args, **kwargs: array
+    mock.__getitem__.side_effect = lambda key: array[key]
+    vasp = VaspData(mock)
+    key = slice(None, None, 100)
+    Assert.allclose(vasp[key], array[key])
+    mock.__getitem__.assert_called_once_with(key)
+
+
+def test_large_combined_stride_is_not_expanded(Assert):
+    array = np.arange(4096).reshape(16, 16, 16)
+    mock = MagicMock()
+    mock.__array__ = lambda *args, **kwargs: array
+    mock.__getitem__.side_effect = lambda key: array[key]
+    vasp = VaspData(mock)
+    key = (slice(None, None, 2), slice(None, None, 2), slice(None, None, 4))
+    Assert.allclose(vasp[key], array[key])
+    mock.__getitem__.assert_called_once_with(key)
+
+
+def test_strided_slice_does_not_keep_expanded_read(tmp_path):
+    filename = tmp_path / "data.h5"
+    reference = np.arange(64.0).reshape(8, 8)
+    with h5py.File(filename, "w") as file:
+        file["data"] = reference
+    with h5py.File(filename, "r") as file:
+        actual = VaspData(file["data"])[::2, ::2]
+    assert np.array_equal(actual, reference[::2, ::2])
+    assert actual.base is None
+
+
 def test_list_data(Assert):
     data = [[1, 2, 3], [4, 5, 6]]
     reference = np.array(data)
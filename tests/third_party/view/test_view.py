@@ -168,12 +168,53 @@ def test_structure_to_view(view, Assert):
         assert output_line.strip() == expected_line.strip()
 
 
+def test_positions_outside_cell_are_wrapped(view):
+    view.positions = np.add(view.positions, [1.0, -1.0, 2.0])
+    widget = view.to_ngl()
+    for idx_traj in range(len(view.lattice_vectors)):
+        positions = np.mod(view.positions[idx_traj], 1)
+        expected_coordinates = positions @ view.lattice_vectors[idx_traj]
+        output_coordinates = widget.trajectory_0.get_coordinates(idx_traj)
+        assert np.allclose(expected_coordinates, output_coordinates)
+
+
 @patch("nglview.NGLWidget._ipython_display_", autospec=True)
 def test_ipython(mock_display, view):
     display = view._ipython_display_()
     mock_display.assert_called_once()
 
 
+@patch("nglview.NGLWidget._ipython_display_", autospec=True)
+def test_ipython_reuses_widget(mock_display, view):
+    original_to_ngl = View.to_ngl
+    with patch.object(View, "to_ngl", autospec=True) as to_ngl:
+        to_ngl.side_effect = original_to_ngl
+        view._ipython_display_()
+        view._ipython_display_()
+        to_ngl.assert_called_once()
+        view.camera = "perspective"
+        view._ipython_display_()
+        assert to_ngl.call_count == 2
+        view.positions = np.add(view.positions, 0.01)
+        view._ipython_display_()
+        assert to_ngl.call_count == 3
+    assert mock_display.call_count == 4
+
+
+@patch("nglview.NGLWidget._ipython_display_", autospec=True)
+def test_ipython_rebuilds_widget_after_reassignment(mock_display, view_arrow):
+    original_to_ngl = View.to_ngl
+    with patch.object(View, "to_ngl", autospec=True) as to_ngl:
+        to_ngl.side_effect = original_to_ngl
+        view_arrow._ipython_display_()
+        view_arrow.ion_arrows[0].color = "#FF0000"
+        view_arrow.ion_arrows = view_arrow.ion_arrows
+        view_arrow._ipython_display_()
+        assert to_ngl.call_count == 2
+        view_arrow._ipython_display_()
+        assert to_ngl.call_count == 2
+
+
 @pytest.mark.parametrize("camera", ("orthographic", "perspective"))
 def test_camera(view, camera):
     view.camera = camera
@@ -236,6 +277,67 @@ def test_shifted_isosurface(view3d):
     assert message_archive[current_message]["methodName"] != "loadFile"
 
 
+def test_isosurface_supercell(view3d):
+    supercell = (2, 1, 3)
+    view3d.supercell = supercell
+    widget = view3d.to_ngl()
+    message_archive = widget.get_state()["_ngl_msg_archive"]
+    current_message = 2  # first two are for loading structure and setting camera
+    step = 0
+    for grid_scalar in view3d.ref.grid_scalars:
+        if not grid_scalar.isosurfaces:
+            continue
+        expected_data = np.tile(grid_scalar.quantity[step], supercell)
+        assert message_archive[current_message]["methodName"] == "loadFile"
+        output_cube = message_archive[current_message]["args"][0]["data"]
+        output_data = ase_cube.read_cube(io.StringIO(output_cube))["data"]
+        assert expected_data.shape == output_data.shape
+        assert np.allclose(expected_data, output_data)
+        current_message += len(grid_scalar.isosurfaces) + 1
+    assert message_archive[current_message]["methodName"] != "loadFile"
+
+
+@pytest.mark.parametrize("kind", ("list", "complex"))
+def test_isosurface_of_list_or_complex_quantity(kind, not_core):
+    inputs = base_input_view(is_structure=False)
+    data = np.random.rand(1, 6, 5, 4) + 1j * np.random.rand(1, 6, 5, 4)
+    quantity = data.real.tolist() if kind == "list" else data
+    isosurface = Isosurface(isolevel=0.1, color="#2FB5AB", opacity=0.6)
+    grid_scalar = GridQuantity(quantity, "quantity", [isosurface])
+    view = View(grid_scalars=[grid_scalar], shift=[0.5, 0, 0], **inputs)
+    widget = view.to_ngl()
+    message_archive = widget.get_state()["_ngl_msg_archive"]
+    output_cube = message_archive[2]["args"][0]["data"]
+    output_data = ase_cube.read_cube(io.StringIO(output_cube))["data"]
+    expected_data = data.real if kind == "list" else np.abs(data)
+    expected_data = np.roll(expected_data[0], (3, 0, 0), axis=(0, 1, 2))
+    assert np.allclose(output_data, expected_data)
+
+
+def test_shifted_isosurface_supercell(view3d):
+    view3d.shift = np.array([0.2, 0.4, 0.6])
+    expected_shift = [2, 4, 5]
+    supercell = (2, 3, 1)
+    view3d.supercell = supercell
+    widget = view3d.to_ngl()
+    message_archive = widget.get_state()["_ngl_msg_archive"]
+    current_message = 2  # first two are for loading structure and setting camera
+    step = 0
+    for grid_scalar in view3d.ref.grid_scalars:
+        if not grid_scalar.isosurfaces:
+            continue
+        expected_data = grid_scalar.quantity[step]
+        expected_data = np.roll(expected_data, expected_shift, axis=(0, 1, 2))
+        expected_data = np.tile(expected_data, supercell)
+        assert message_archive[current_message]["methodName"] == "loadFile"
+        output_cube = message_archive[current_message]["args"][0]["data"]
+        output_data = ase_cube.read_cube(io.StringIO(output_cube))["data"]
+        assert expected_data.shape == output_data.shape
+        assert np.allclose(expected_data, output_data)
+        current_message += len(grid_scalar.isosurfaces) + 1
+    assert message_archive[current_message]["methodName"] != "loadFile"
+
+
 def test_fail_isosurface(view_multiple_grid_scalars):
     view, grid_scalars = view_multiple_grid_scalars
     with pytest.raises(exception.NotImplemented):